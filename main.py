@@ -4,10 +4,18 @@ import os
 import time
 import shutil
 import json
+import re
+import struct
+import zlib
+import hashlib
+import signal
+import locale
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QSystemTrayIcon, QMenu, QListWidget, QListWidgetItem, QPushButton, QHBoxLayout, QLabel, QDialog, QLineEdit, QFormLayout
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QSize, QTimer, QStandardPaths
-from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor, QKeySequence
+from PyQt6.QtGui import QIcon, QAction, QPixmap, QPainter, QColor, QKeySequence, QClipboard
 from pynput import keyboard
 
 import platform
@@ -20,9 +28,46 @@ ORG_NAME = "SaumonDeluxe"
 DEFAULT_CONFIG = {
     "hotkey": "<ctrl>+<alt>+<shift>+v",
     "retention_days": 7,
-    "run_on_startup": False
+    "run_on_startup": False,
+    "capture_selection": False,
+    "selection_ring_size": 50
 }
 
+# Primary selection changes on every mouse move during a drag
+SELECTION_SETTLE_MS = 500 # only keep a selection once it stopped changing
+SELECTION_FLUSH_MS = 30000 # batch ring writes to disk
+SELECTION_DRAG_MS = 3000 # a selection growing/shrinking within this window is the same drag
+
+# History file naming: data/YYYY-MM-DD/TIMESTAMP_text.txt or TIMESTAMP_image.png
+CLIP_NAME_RE = re.compile(r'^(\d+)_(text\.txt|image\.png)$')
+# Images captured but not yet moved into history: temp_images/temp_TIMESTAMP.png
+TEMP_IMAGE_NAME_RE = re.compile(r'^temp_(\d+)\.png$')
+MIN_SANE_TIMESTAMP = 946684800000 # 2000-01-01, anything older is garbage
+
+# Text clips used to be written in the locale encoding (cp1252 on Windows)
+LEGACY_TEXT_ENCODING = locale.getpreferredencoding(False)
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4} # color type -> samples per pixel
+
+def get_day_folder(data_dir, timestamp):
+    date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d')
+    return os.path.join(data_dir, date_str)
+
+def decode_text_clip(data):
+    # Returns (text, is_legacy); raises UnicodeDecodeError if neither encoding fits
+    try:
+        return data.decode('utf-8'), False
+    except UnicodeDecodeError:
+        return data.decode(LEGACY_TEXT_ENCODING), True
+
+def get_temp_images_dir():
+    # Use CacheLocation for temporary images
+    temp_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not temp_dir:
+        temp_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation)
+    return os.path.join(temp_dir, "temp_images")
+
 class StartupManager:
     def __init__(self):
         self.system = platform.system()
@@ -149,6 +194,116 @@ class ConfigManager:
         self.config[key] = value
         self.save_config()
 
+class SelectionHistory(QObject):
+    # Fixed-size, in-memory ring for the X11/Wayland primary selection.
+    # Kept apart from the clipboard history: no file per entry, lazy saves.
+    changed = pyqtSignal()
+
+    def __init__(self, base_data_path, config_manager, parent=None):
+        super().__init__(parent)
+        self.history_file = os.path.join(base_data_path, "selection.json")
+        self.config_manager = config_manager
+        self.items = deque(maxlen=self.get_ring_size())
+        self.dirty = False
+
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SELECTION_SETTLE_MS)
+        self.settle_timer.timeout.connect(self.capture)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(SELECTION_FLUSH_MS)
+        self.flush_timer.timeout.connect(self.save)
+
+        self.load()
+
+    def get_ring_size(self):
+        # Hand-edited in config.json: a bad value must not crash startup
+        try:
+            return max(1, int(self.config_manager.get("selection_ring_size")))
+        except (TypeError, ValueError):
+            return DEFAULT_CONFIG["selection_ring_size"]
+
+    def load(self):
+        if os.path.exists(self.history_file):
+            try:
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+                # File is newest first: keep the newest ones if the ring shrank
+                for entry in entries[:self.items.maxlen]:
+                    self.items.append({"type": "text", "timestamp": entry["timestamp"], "content": entry["content"]})
+                if len(entries) > self.items.maxlen:
+                    self.dirty = True
+            except Exception as e:
+                print(f"Error loading selection history: {e}")
+        self.prune_expired()
+        self.save()
+
+    def prune_expired(self):
+        # Selections can hold secrets: never keep them longer than the clipboard history
+        retention_ms = self.config_manager.get("retention_days") * 24 * 60 * 60 * 1000
+        cutoff = int(time.time() * 1000) - retention_ms
+        pruned = False
+        # Newest first, so expired entries are all at the right end
+        while self.items and self.items[-1]['timestamp'] < cutoff:
+            self.items.pop()
+            pruned = True
+        if pruned:
+            self.dirty = True
+        return pruned
+
+    def expire(self):
+        # Called periodically: expired entries must leave disk too, not wait for a capture
+        if self.prune_expired():
+            self.save()
+            self.changed.emit()
+
+    def save(self):
+        self.prune_expired()
+        if not self.dirty:
+            return
+        tmp_file = self.history_file + ".tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump([{"timestamp": item["timestamp"], "content": item["content"]} for item in self.items], f)
+            os.replace(tmp_file, self.history_file)
+            self.dirty = False
+        except Exception as e:
+            print(f"Error saving selection history: {e}")
+
+    def on_selection_changed(self):
+        # Hot path during a drag: don't read the selection, just push the deadline back
+        if self.config_manager.get("capture_selection"):
+            self.settle_timer.start()
+
+    def capture(self):
+        if not self.config_manager.get("capture_selection"):
+            return
+        text = QApplication.clipboard().text(QClipboard.Mode.Selection)
+        if not text or not text.strip():
+            return
+        if self.items and self.items[0]['content'] == text:
+            return
+
+        now = int(time.time() * 1000)
+        if self.items and now - self.items[0]['timestamp'] < SELECTION_DRAG_MS:
+            newest = self.items[0]['content']
+            if newest in text or text in newest:
+                # The user paused mid-drag: this is the same selection, keep only the latest
+                self.items.popleft()
+
+        for existing in self.items:
+            if existing['content'] == text:
+                self.items.remove(existing)
+                break
+
+        self.items.appendleft({"type": "text", "timestamp": now, "content": text})
+        self.dirty = True
+        if not self.flush_timer.isActive():
+            self.flush_timer.start()
+        self.changed.emit()
+
 class SignalHandler(QObject):
     toggle_visibility = pyqtSignal()
     quit_app = pyqtSignal()
@@ -163,7 +318,7 @@ class SettingsDialog(QDialog):
         self.config_manager = config_manager
         self.startup_manager = startup_manager
         self.setWindowTitle("Settings")
-        self.setFixedSize(300, 200)
+        self.setFixedSize(300, 230)
         self.setStyleSheet("background-color: #2e2e2e; color: white;")
         
         layout = QVBoxLayout()
@@ -178,9 +333,14 @@ class SettingsDialog(QDialog):
         self.startup_check = QCheckBox("Run on Startup")
         self.startup_check.setChecked(self.config_manager.get("run_on_startup"))
         # self.startup_check.setChecked(self.startup_manager.is_enabled()) # Could also sync with system
+
+        self.selection_check = QCheckBox("Capture Primary Selection")
+        self.selection_check.setChecked(self.config_manager.get("capture_selection"))
+        self.selection_check.setEnabled(QApplication.clipboard().supportsSelection())
         
         form_layout.addRow("Global Hotkey:", self.hotkey_input)
         form_layout.addRow("", self.startup_check)
+        form_layout.addRow("", self.selection_check)
         
         layout.addLayout(form_layout)
         
@@ -194,9 +354,11 @@ class SettingsDialog(QDialog):
     def save_settings(self):
         new_hotkey = self.hotkey_input.text()
         run_startup = self.startup_check.isChecked()
+        capture_selection = self.selection_check.isChecked()
         
         self.config_manager.set("hotkey", new_hotkey)
         self.config_manager.set("run_on_startup", run_startup)
+        self.config_manager.set("capture_selection", capture_selection)
         
         # Apply startup logic
         self.startup_manager.set_startup(run_startup)
@@ -205,11 +367,13 @@ class SettingsDialog(QDialog):
         self.accept()
 
 class OverlayWindow(QWidget):
-    def __init__(self, data_dir, config_manager, startup_manager):
+    def __init__(self, data_dir, config_manager, startup_manager, selection_history):
         super().__init__()
         self.data_dir = data_dir
         self.config_manager = config_manager
         self.startup_manager = startup_manager
+        self.selection_history = selection_history
+        self.show_selection = False
         self.history = []
         self.load_history()
         self.initUI()
@@ -240,6 +404,20 @@ class OverlayWindow(QWidget):
         
         # Header with Settings button
         header_layout = QHBoxLayout()
+
+        # Switch the list between clipboard history and primary selection ring
+        self.selection_btn = QPushButton("Selection")
+        self.selection_btn.setCheckable(True)
+        self.selection_btn.setFixedHeight(30)
+        self.selection_btn.setStyleSheet("""
+            QPushButton { background-color: transparent; color: gray; font-size: 14px; border: none; }
+            QPushButton:checked { color: white; }
+        """)
+        self.selection_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.selection_btn.toggled.connect(self.toggle_selection_view)
+        self.selection_btn.setVisible(QApplication.clipboard().supportsSelection())
+        header_layout.addWidget(self.selection_btn)
+
         header_layout.addStretch()
         
         settings_btn = QPushButton("⚙") # Gear icon
@@ -280,6 +458,22 @@ class OverlayWindow(QWidget):
         
         self.update_list()
 
+        self.selection_history.changed.connect(self.on_selection_history_changed)
+
+    def toggle_selection_view(self, checked):
+        self.show_selection = checked
+        self.update_list()
+
+    def on_selection_history_changed(self):
+        # Nobody is looking at the ring: rebuild lazily when it is shown
+        if self.show_selection and self.isVisible():
+            self.update_list()
+
+    def current_items(self):
+        if self.show_selection:
+            return list(self.selection_history.items)
+        return self.history
+
     def open_settings(self):
         dlg = SettingsDialog(self.config_manager, self.startup_manager, self)
         dlg.exec()
@@ -288,6 +482,8 @@ class OverlayWindow(QWidget):
         if self.isVisible():
             self.hide()
         else:
+            if self.show_selection:
+                self.update_list()
             self.show()
             self.activateWindow()
             self.list_widget.setFocus()
@@ -301,8 +497,7 @@ class OverlayWindow(QWidget):
             super().keyPressEvent(event)
 
     def get_day_folder(self, timestamp):
-        date_str = datetime.fromtimestamp(timestamp / 1000).strftime('%Y-%m-%d')
-        return os.path.join(self.data_dir, date_str)
+        return get_day_folder(self.data_dir, timestamp)
 
     def load_history(self):
         self.history = []
@@ -334,8 +529,8 @@ class OverlayWindow(QWidget):
 
                     if "text.txt" in filename:
                         item["type"] = "text"
-                        with open(filepath, 'r') as f:
-                            item["content"] = f.read()
+                        with open(filepath, 'rb') as f:
+                            item["content"], _ = decode_text_clip(f.read())
                     elif "image.png" in filename:
                         item["type"] = "image"
                     else:
@@ -360,7 +555,7 @@ class OverlayWindow(QWidget):
         if item_dict['type'] == 'text':
             filename = f"{timestamp}_text.txt"
             filepath = os.path.join(folder, filename)
-            with open(filepath, 'w') as f:
+            with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(item_dict['content'])
             item_dict['path'] = filepath
             item_dict['timestamp'] = timestamp
@@ -397,6 +592,8 @@ class OverlayWindow(QWidget):
         
         for item in items_to_remove:
             self.history.remove(item)
+
+        self.selection_history.expire()
             
         if items_to_remove:
             self.update_list()
@@ -451,7 +648,7 @@ class OverlayWindow(QWidget):
         self.list_widget.clear()
         badge = self.create_badge()
         
-        for i, item in enumerate(self.history):
+        for i, item in enumerate(self.current_items()):
             if item['type'] == 'text':
                 display_text = item['content'].replace('\n', ' ')
                 if len(display_text) > 50:
@@ -491,13 +688,17 @@ class OverlayWindow(QWidget):
 
     def copy_item(self, item):
         index = self.list_widget.row(item)
-        if 0 <= index < len(self.history):
-            entry = self.history[index]
+        items = self.current_items()
+        if 0 <= index < len(items):
+            entry = items[index]
             
             clipboard = QApplication.clipboard()
             
             if entry['type'] == 'text':
+                # Main clipboard too, so Ctrl+V works (this also adds it to the history)
                 clipboard.setText(entry['content'])
+                if self.show_selection:
+                    clipboard.setText(entry['content'], QClipboard.Mode.Selection)
             elif entry['type'] == 'image':
                 pixmap = QPixmap(entry['path'])
                 if not pixmap.isNull():
@@ -603,12 +804,7 @@ def clipboard_changed():
             # Save to temp location using QStandardPaths or tempfile
             timestamp = int(time.time() * 1000)
             
-            # Use CacheLocation for temporary images
-            temp_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
-            if not temp_dir:
-                temp_dir = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.TempLocation)
-                
-            temp_images_dir = os.path.join(temp_dir, "temp_images")
+            temp_images_dir = get_temp_images_dir()
             if not os.path.exists(temp_images_dir):
                 os.makedirs(temp_images_dir)
             
@@ -626,7 +822,255 @@ def clipboard_changed():
         except Exception:
             pass
 
+def check_png(data):
+    # Walk the chunk list, verify every CRC and inflate the image data so a
+    # truncated or bit-flipped file is caught without needing Qt in the worker.
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("bad PNG signature")
+
+    pos = len(PNG_SIGNATURE)
+    header = None
+    decompressor = zlib.decompressobj()
+    raw_size = 0
+    seen_end = False
+
+    while pos + 12 <= len(data):
+        length, = struct.unpack('>I', data[pos:pos + 4])
+        chunk_type = data[pos + 4:pos + 8]
+        end = pos + 12 + length
+        if end > len(data):
+            break
+        body = data[pos + 8:pos + 8 + length]
+        crc, = struct.unpack('>I', data[end - 4:end])
+        if zlib.crc32(chunk_type + body) != crc:
+            raise ValueError(f"CRC mismatch in {chunk_type.decode('latin-1')} chunk")
+
+        if header is None:
+            if chunk_type != b'IHDR' or length != 13:
+                raise ValueError("missing IHDR chunk")
+            header = struct.unpack('>IIBBBBB', body)
+        elif chunk_type == b'IDAT':
+            raw_size += len(decompressor.decompress(body))
+        elif chunk_type == b'IEND':
+            seen_end = True
+            break
+        pos = end
+
+    if header is None:
+        raise ValueError("missing IHDR chunk")
+    if not seen_end:
+        raise ValueError("truncated PNG (no IEND chunk)")
+    raw_size += len(decompressor.flush())
+    if not decompressor.eof:
+        raise ValueError("truncated image data")
+
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if width == 0 or height == 0 or color_type not in PNG_CHANNELS:
+        raise ValueError("invalid IHDR chunk")
+    if interlace == 0:
+        row_size = 1 + (width * PNG_CHANNELS[color_type] * bit_depth + 7) // 8
+        if raw_size != height * row_size:
+            raise ValueError("image data does not match dimensions")
+    return width, height
+
+def fsck_check_file(path):
+    # Runs inside the fsck process pool: must only read, never modify.
+    # Returns (path, problem, detail, info); problem is None for a healthy file.
+    filename = os.path.basename(path)
+    match = CLIP_NAME_RE.match(filename)
+    if match:
+        clip_type = "text" if match.group(2) == "text.txt" else "image"
+    else:
+        match = TEMP_IMAGE_NAME_RE.match(filename)
+        if not match:
+            return path, "unrecognized file", filename, None
+        clip_type = "image"
+
+    timestamp = int(match.group(1))
+    max_timestamp = int(time.time() * 1000) + 24 * 60 * 60 * 1000
+    if not MIN_SANE_TIMESTAMP <= timestamp <= max_timestamp:
+        return path, "bad timestamp", str(timestamp), None
+
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
+        return path, "unreadable", str(e), None
+
+    if not data:
+        return path, "empty file", None, None
+
+    info = {
+        "type": clip_type,
+        "timestamp": timestamp,
+        "size": len(data),
+        "hash": hashlib.sha1(data).hexdigest()
+    }
+    if clip_type == "text":
+        try:
+            _, info["legacy_encoding"] = decode_text_clip(data)
+        except UnicodeDecodeError as e:
+            return path, "invalid text encoding", str(e), None
+    else:
+        try:
+            info["width"], info["height"] = check_png(data)
+        except (ValueError, zlib.error, struct.error) as e:
+            return path, "corrupt image", str(e), None
+
+    return path, None, None, info
+
+def list_files(root, depth):
+    # depth 1: files directly in root, depth 2: files in root's subfolders
+    paths = []
+    if not os.path.isdir(root):
+        return paths
+    for entry in os.scandir(root):
+        if depth > 1 and entry.is_dir(follow_symlinks=False):
+            paths.extend(list_files(entry.path, depth - 1))
+        elif depth == 1 and entry.is_file(follow_symlinks=False):
+            paths.append(entry.path)
+    return paths
+
+def remove_old_quarantine_runs(quarantine_root, retention_days):
+    # Quarantine runs are named after their start time, see run_fsck
+    cutoff = time.time() - retention_days * 24 * 60 * 60
+    errors = 0
+    if not os.path.isdir(quarantine_root):
+        return errors
+    for run_folder in os.listdir(quarantine_root):
+        try:
+            run_time = datetime.strptime(run_folder, '%Y-%m-%d_%H%M%S').timestamp()
+        except ValueError:
+            continue
+        if run_time < cutoff:
+            try:
+                shutil.rmtree(os.path.join(quarantine_root, run_folder))
+            except OSError as e:
+                print(f"Error removing quarantine run {run_folder}: {e}")
+                errors += 1
+    return errors
+
+def run_fsck(base_data_path, data_dir, temp_images_dir, retention_days, max_workers=None):
+    start_time = time.time()
+    print(f"Checking {data_dir}")
+
+    quarantine_root = os.path.join(base_data_path, "quarantine")
+    errors = remove_old_quarantine_runs(quarantine_root, retention_days)
+
+    clip_paths = list_files(data_dir, 2)
+    temp_paths = list_files(temp_images_dir, 1)
+    paths = clip_paths + temp_paths
+    temp_set = set(temp_paths)
+
+    quarantine_dir = os.path.join(quarantine_root, datetime.now().strftime('%Y-%m-%d_%H%M%S'))
+
+    def quarantine(path):
+        root = temp_images_dir if path in temp_set else data_dir
+        dest = os.path.join(quarantine_dir, os.path.basename(root), os.path.relpath(path, root))
+        try:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.move(path, dest)
+            return True
+        except Exception as e:
+            print(f"Error quarantining {path}: {e}")
+            return False
+
+    problems = {}
+    counts = {"text": 0, "image": 0}
+    total_bytes = 0
+    hashes = set()
+    duplicates = 0
+    recovered = 0
+    reencoded = 0
+
+    workers = max_workers or os.cpu_count() or 1
+    chunksize = max(1, len(paths) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, problem, detail, info in pool.map(fsck_check_file, paths, chunksize=chunksize):
+            if problem:
+                problems[problem] = problems.get(problem, 0) + 1
+                print(f"  {problem}: {path}" + (f" ({detail})" if detail else ""))
+                if not quarantine(path):
+                    errors += 1
+                continue
+
+            if info.get("legacy_encoding"):
+                # Written by an older version in the locale encoding: convert, don't discard
+                tmp_path = path + ".tmp"
+                try:
+                    with open(path, 'rb') as f:
+                        text, _ = decode_text_clip(f.read())
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        f.write(text)
+                    os.replace(tmp_path, path)
+                    reencoded += 1
+                except (OSError, UnicodeError) as e:
+                    print(f"Error converting {path} to UTF-8: {e}")
+                    errors += 1
+
+            if path in temp_set:
+                # Captured before an unclean shutdown but never moved into history
+                dest = os.path.join(get_day_folder(data_dir, info["timestamp"]), f"{info['timestamp']}_image.png")
+                if os.path.exists(dest):
+                    problems["orphan temp image"] = problems.get("orphan temp image", 0) + 1
+                    if not quarantine(path):
+                        errors += 1
+                    continue
+                try:
+                    os.makedirs(os.path.dirname(dest), exist_ok=True)
+                    shutil.move(path, dest)
+                    recovered += 1
+                except OSError as e:
+                    print(f"Error recovering {path}: {e}")
+                    errors += 1
+                    continue
+
+            counts[info["type"]] += 1
+            total_bytes += info["size"]
+            key = (info["type"], info["hash"])
+            if key in hashes:
+                duplicates += 1
+            hashes.add(key)
+
+    # Quarantining may have emptied some day folders
+    if os.path.isdir(data_dir):
+        for date_folder in os.listdir(data_dir):
+            full_date_folder = os.path.join(data_dir, date_folder)
+            try:
+                if os.path.isdir(full_date_folder) and not os.listdir(full_date_folder):
+                    os.rmdir(full_date_folder)
+            except OSError as e:
+                print(f"Error removing folder {full_date_folder}: {e}")
+                errors += 1
+
+    quarantined = sum(problems.values())
+    print(f"Checked {len(paths)} files in {time.time() - start_time:.2f}s")
+    print(f"  {counts['text']} text clips, {counts['image']} image clips, {total_bytes / (1024 * 1024):.1f} MiB")
+    print(f"  {duplicates} duplicate clips")
+    print(f"  {recovered} orphan temp images recovered")
+    print(f"  {reencoded} text clips converted to UTF-8")
+    print(f"  {quarantined} files quarantined" + (f" to {quarantine_dir}" if quarantined else ""))
+    for problem, count in sorted(problems.items()):
+        print(f"    {problem}: {count}")
+    if errors:
+        print(f"  {errors} repairs failed")
+
+    # fsck convention: 0 = clean, 1 = errors corrected, 4 = errors left uncorrected
+    if errors:
+        return 4
+    return 1 if quarantined or recovered or reencoded else 0
+
+
 if __name__ == '__main__':
+    if '--fsck' in sys.argv:
+        # Check the history without starting the GUI (safe to run headless)
+        QApplication.setApplicationName(APP_NAME)
+        QApplication.setOrganizationName(ORG_NAME)
+        base_data_path = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppLocalDataLocation)
+        config_manager = ConfigManager(base_data_path)
+        sys.exit(run_fsck(base_data_path, os.path.join(base_data_path, "data"), get_temp_images_dir(),
+                          config_manager.get("retention_days")))
+
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
     app.setApplicationName(APP_NAME)
@@ -648,7 +1092,18 @@ if __name__ == '__main__':
     # Signal handler to communicate between thread and GUI
     signal_handler = SignalHandler()
     
-    window = OverlayWindow(data_dir, config_manager, startup_manager)
+    # Primary selection ring (X11/Wayland only)
+    selection_history = SelectionHistory(base_data_path, config_manager)
+    app.aboutToQuit.connect(selection_history.save)
+
+    # systemctl stop sends SIGTERM: quit cleanly so aboutToQuit flushes the ring.
+    # Python only runs signal handlers between bytecodes, so wake it up regularly.
+    signal.signal(signal.SIGTERM, lambda *_: app.quit())
+    signal_timer = QTimer()
+    signal_timer.timeout.connect(lambda: None)
+    signal_timer.start(500)
+
+    window = OverlayWindow(data_dir, config_manager, startup_manager, selection_history)
     
     # Connect signals
     signal_handler.toggle_visibility.connect(window.toggle)
@@ -661,6 +1116,8 @@ if __name__ == '__main__':
     # Clipboard monitoring
     clipboard = app.clipboard()
     clipboard.dataChanged.connect(clipboard_changed)
+    if clipboard.supportsSelection():
+        clipboard.selectionChanged.connect(selection_history.on_selection_changed)
 
     # System Tray Icon
     tray_icon = QSystemTrayIcon(QIcon.fromTheme("applications-system"), app)